@@ -9,104 +9,113 @@ computed/works-index.json relative to the repository root.
 
 from __future__ import annotations
 
+import argparse
 import hashlib
 import json
+import os
 import shutil
 import subprocess
 import sys
+import tempfile
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
-from urllib.request import urlopen, Request
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.media_fetch import (
+    DEFAULT_BACKOFF,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRIES,
+    BudgetExceeded,
+    FetchError,
+    FetchPolicy,
+    download,
+    head,
+)
+from scripts.media_renditions import (
+    describe_rendition,
+    ffmpeg_available,
+    file_sha256,
+    plan_renditions,
+    run_jobs,
+)
+from scripts.media_store import MediaStore
+from scripts.work_catalog import WorkCatalog, build_value_indexes, save_value_indexes
 
 try:
     from PIL import Image
 except ImportError:  # pragma: no cover - optional dependency
     Image = None
 
-ROOT = Path(__file__).resolve().parent.parent
 WORKS_DIR = ROOT / "docs" / "works"
 OUTPUT_DIR = ROOT / "computed"
 OUTPUT_PATH = OUTPUT_DIR / "works-index.json"
+SHARDS_DIR = OUTPUT_DIR / "works"
+MANIFEST_PATH = OUTPUT_DIR / "works-manifest.json"
+VALUES_INDEX_PATH = OUTPUT_DIR / "work-values-index.json"
+SHARD_HASH_LENGTH = 12
 MEDIA_CACHE_DIR = OUTPUT_DIR / "media-cache"
 MEDIA_METADATA_PATH = MEDIA_CACHE_DIR / "metadata.json"
-DEFAULT_USER_AGENT = "hyperobjects-works-index/1.0"
+MEDIA_DB_PATH = MEDIA_CACHE_DIR / "cache.sqlite3"
+MEDIA_BLOBS_DIR = MEDIA_CACHE_DIR / "blobs"
+MEDIA_LOCK_PATH = ROOT / "media-lock.json"
+RENDITIONS_DIR = OUTPUT_DIR / "renditions"
+# Mirrors getLatestWorks() in src/pages/feed.tsx.
+FEED_WORK_LIMIT = 100
+BUDGET_TOP_ASSETS = 10
+DEFAULT_VIEWPORT_WIDTH = 1280
+DEFAULT_VIEWPORT_HEIGHT = 800
+DEFAULT_DEVICE_PIXEL_RATIO = 1.0
+LOCK_FIELDS = ("width", "height", "kind", "size", "etag", "lastModified")
+DEFAULT_FAILURE_COOLDOWN = 6 * 60 * 60
+FFPROBE_TIMEOUT = 60
 
 VIDEO_EXTENSIONS = {".mp4", ".m4v", ".webm", ".ogg", ".ogv", ".mov", ".avi"}
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".svg", ".bmp", ".tiff"}
 
 
-def extract_frontmatter(markdown_path: Path) -> Tuple[Dict[str, Any], int]:
-    text = markdown_path.read_text(encoding="utf-8")
-    if not text.startswith("---"):
-        raise ValueError(f"{markdown_path} is missing frontmatter.")
+def collect_works(parse_cache: Optional[MediaStore] = None) -> List[Dict[str, Any]]:
+    return WorkCatalog.load(ROOT, WORKS_DIR, parse_cache=parse_cache).to_entries()
 
-    lines = text.splitlines()
-    if lines[0].strip() != "---":
-        raise ValueError(f"{markdown_path} frontmatter must begin with '---'.")
 
-    front_lines: List[str] = []
-    end_index = None
-    for idx, line in enumerate(lines[1:], start=1):
-        if line.strip() == "---":
-            end_index = idx
-            break
-        front_lines.append(line)
+def open_media_metadata() -> MediaStore:
+    return MediaStore.open(MEDIA_DB_PATH, MEDIA_METADATA_PATH)
 
-    if end_index is None:
-        raise ValueError(f"{markdown_path} frontmatter must end with '---'.")
 
-    data: Dict[str, Any] = {}
-    for raw_line in front_lines:
-        line = raw_line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if ":" not in line:
-            raise ValueError(f"Unrecognized frontmatter line '{raw_line}' in {markdown_path}.")
-        key, value = line.split(":", 1)
-        key = key.strip()
-        value = value.strip()
-        if not key:
-            raise ValueError(f"Frontmatter key missing in line '{raw_line}' of {markdown_path}.")
-        if value.startswith('"') and value.endswith('"'):
-            processed = value[1:-1].replace(r'\"', '"').replace(r"\\", "\\")
-        else:
-            try:
-                processed = int(value)
-            except ValueError:
-                processed = value
-        data[key] = processed
-
-    return data, end_index + 1
-
-
-def collect_works() -> List[Dict[str, Any]]:
-    if not WORKS_DIR.exists():
-        raise FileNotFoundError(f"Works directory not found: {WORKS_DIR}")
-
-    entries: List[Dict[str, str]] = []
-    for md_path in sorted(WORKS_DIR.rglob("*.md")):
-        if md_path.name == "index.md":
-            continue
-        frontmatter, _ = extract_frontmatter(md_path)
-        entry = dict(frontmatter)
-        entry["file"] = str(md_path.relative_to(ROOT))
-        entries.append(entry)
+def load_media_lock() -> Dict[str, Any]:
+    if not MEDIA_LOCK_PATH.exists():
+        return {}
+    lock = json.loads(MEDIA_LOCK_PATH.read_text(encoding="utf-8"))
+    if not isinstance(lock, dict):
+        raise ValueError("expected a JSON object keyed by media URL")
+    return lock
 
-    return entries
 
+def read_media_lock_or_exit() -> Dict[str, Any]:
+    try:
+        return load_media_lock()
+    except (OSError, ValueError) as err:
+        print(f"Failed to read {MEDIA_LOCK_PATH.relative_to(ROOT)}: {err}", file=sys.stderr)
+        sys.exit(1)
 
-def load_media_metadata() -> Dict[str, Any]:
-    if MEDIA_METADATA_PATH.exists():
-        try:
-            return json.loads(MEDIA_METADATA_PATH.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-    return {}
 
+def save_media_lock(lock: Dict[str, Any]) -> None:
+    MEDIA_LOCK_PATH.write_text(json.dumps(lock, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
-def save_media_metadata(metadata: Dict[str, Any]) -> None:
-    MEDIA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    MEDIA_METADATA_PATH.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+
+def lock_entry_from_metadata(cached: Dict[str, Any]) -> Dict[str, Any]:
+    entry = {key: cached[key] for key in LOCK_FIELDS if cached.get(key) is not None}
+    if cached.get("contentHash"):
+        entry["sha256"] = cached["contentHash"]
+    if "size" not in entry and cached.get("path") and Path(cached["path"]).exists():
+        entry["size"] = Path(cached["path"]).stat().st_size
+    return entry
 
 
 def best_media_source(entry: Dict[str, Any]) -> Optional[str]:
@@ -114,17 +123,68 @@ def best_media_source(entry: Dict[str, Any]) -> Optional[str]:
 
 
 def cache_path_for(url: str) -> Path:
+    """Where older cache layouts stored a URL's download, before blobs existed."""
     digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
     extension = Path(url.split("?")[0]).suffix
     return MEDIA_CACHE_DIR / f"{digest}{extension}"
 
 
-def download_media(url: str, destination: Path) -> None:
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    req = Request(url, headers={"User-Agent": DEFAULT_USER_AGENT})
-    with urlopen(req) as response:
-        data = response.read()
-    destination.write_bytes(data)
+def blob_path_for(content_hash: str) -> Path:
+    return MEDIA_BLOBS_DIR / content_hash[:2] / content_hash
+
+
+def fetch_media_blob(url: str, policy: FetchPolicy) -> Tuple[Path, str, Dict[str, str]]:
+    """Download ``url`` into the content-addressed blob store.
+
+    Returns the blob path, the SHA-256 of its bytes and the response
+    validators. A file left at the legacy staging path is adopted instead of
+    downloaded again. Every call stages under its own temporary name, so
+    concurrent builds fetching the same URL do not trip over each other.
+    """
+    MEDIA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    handle, name = tempfile.mkstemp(dir=MEDIA_CACHE_DIR, prefix=".download-")
+    os.close(handle)
+    staging = Path(name)
+    validators: Dict[str, str] = {}
+    try:
+        try:
+            # Atomic, so only one process can claim a legacy file.
+            os.replace(cache_path_for(url), staging)
+        except FileNotFoundError:
+            validators = download_media(url, staging, policy)
+        content_hash = file_sha256(staging)
+        blob = blob_path_for(content_hash)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staging, blob)
+    finally:
+        staging.unlink(missing_ok=True)
+    return blob, content_hash, validators
+
+
+def download_media(url: str, destination: Path, policy: FetchPolicy) -> Dict[str, str]:
+    return download(url, destination, policy)
+
+
+def media_changed(url: str, entry: Dict[str, Any], policy: FetchPolicy) -> bool:
+    """Revalidate a locked URL with a conditional HEAD request."""
+    headers: Dict[str, str] = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("lastModified"):
+        headers["If-Modified-Since"] = entry["lastModified"]
+    if not headers:
+        return True
+    try:
+        status, response_headers = head(url, policy, headers)
+    except BudgetExceeded:
+        raise
+    except FetchError:
+        return True
+    if status == 304:
+        return False
+    current = {"etag": response_headers.get("etag"), "lastModified": response_headers.get("last-modified")}
+    return any(current[key] != entry.get(key) for key in current if current[key])
 
 
 def infer_media_kind_from_url(url: str) -> str:
@@ -156,7 +216,7 @@ def ffprobe_available() -> bool:
     return bool(_FFPROBE_AVAILABLE)
 
 
-def get_dimensions_with_ffprobe(path: Path) -> Optional[Tuple[int, int]]:
+def get_dimensions_with_ffprobe(path: Path, timeout: float = FFPROBE_TIMEOUT) -> Optional[Tuple[int, int]]:
     if not ffprobe_available():
         return None
     try:
@@ -177,8 +237,9 @@ def get_dimensions_with_ffprobe(path: Path) -> Optional[Tuple[int, int]]:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
+            timeout=timeout,
         )
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
         return None
 
     try:
@@ -193,63 +254,622 @@ def get_dimensions_with_ffprobe(path: Path) -> Optional[Tuple[int, int]]:
     return None
 
 
+def in_failure_cooldown(cached: Optional[Dict[str, Any]], cooldown: float) -> bool:
+    if not cached or "error" not in cached:
+        return False
+    return time.time() - cached.get("failedAt", 0) < cooldown
+
+
+def record_media_failure(url: str, metadata: MediaStore, reason: str) -> None:
+    previous = metadata.get(url) or {}
+    metadata[url] = {
+        "error": reason,
+        "failedAt": int(time.time()),
+        "failures": previous.get("failures", 0) + 1,
+    }
+
+
 def ensure_media_dimensions(
-    url: Optional[str], metadata: Dict[str, Any]
+    url: Optional[str],
+    metadata: MediaStore,
+    policy: Optional[FetchPolicy] = None,
+    *,
+    failure_cooldown: float = DEFAULT_FAILURE_COOLDOWN,
 ) -> Optional[Tuple[int, int]]:
+    """Return the dimensions of ``url``, downloading and probing it if needed.
+
+    Download and probe failures are recorded in ``metadata`` and the URL is
+    not tried again until ``failure_cooldown`` seconds have passed. Running out
+    of the policy's time budget is not recorded as a failure.
+    """
     if not url:
         return None
 
     cached = metadata.get(url)
     if cached and cached.get("width") and cached.get("height"):
         return cached["width"], cached["height"]
+    if in_failure_cooldown(cached, failure_cooldown):
+        return None
 
-    cache_path = cache_path_for(url)
-    if not cache_path.exists():
-        try:
-            download_media(url, cache_path)
-        except Exception:
-            return None
-
-    kind = infer_media_kind_from_url(url)
-    dimensions: Optional[Tuple[int, int]] = get_dimensions_with_ffprobe(cache_path)
+    policy = policy or FetchPolicy()
+    try:
+        blob, content_hash, validators = fetch_media_blob(url, policy)
+    except BudgetExceeded:
+        return None
+    except FetchError as err:
+        record_media_failure(url, metadata, str(err))
+        return None
 
-    if not dimensions and Image is not None:
-        dimensions = get_image_dimensions(cache_path)
+    probe = metadata.get_probe(content_hash)
+    if probe is None:
+        dimensions: Optional[Tuple[int, int]] = get_dimensions_with_ffprobe(blob)
+        if not dimensions and Image is not None:
+            dimensions = get_image_dimensions(blob)
+        if dimensions:
+            probe = {"width": dimensions[0], "height": dimensions[1]}
+            metadata.put_probe(content_hash, probe)
 
-    if dimensions:
-        width, height = dimensions
+    if probe:
         metadata[url] = {
-            "width": width,
-            "height": height,
-            "path": str(cache_path),
-            "kind": kind,
+            "width": probe["width"],
+            "height": probe["height"],
+            "path": str(blob),
+            "kind": infer_media_kind_from_url(url),
+            "size": blob.stat().st_size,
+            "contentHash": content_hash,
+            **validators,
         }
-        return width, height
+        return probe["width"], probe["height"]
+
+    record_media_failure(url, metadata, "could not determine media dimensions")
+    return None
+
+
+def lock_media(
+    works: List[Dict[str, Any]],
+    lock: Dict[str, Any],
+    metadata: MediaStore,
+    policy: FetchPolicy,
+    *,
+    refresh: bool = False,
+    failure_cooldown: float = DEFAULT_FAILURE_COOLDOWN,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Probe every referenced media URL and return the refreshed lock.
+
+    Existing entries are kept as-is unless ``refresh`` is set, in which case
+    they are revalidated against their ETag/Last-Modified validators and
+    re-probed when the remote file changed. URLs no work references anymore
+    are dropped. With ``refresh`` the failure cooldown is ignored.
+    """
+    urls = sorted({url for url in (best_media_source(entry) for entry in works) if url})
+    updated: Dict[str, Any] = {}
+    failed: List[str] = []
+    for url in urls:
+        entry = lock.get(url)
+        if policy.expired():
+            if entry:
+                updated[url] = entry
+            failed.append(url)
+            continue
+        if entry and (not refresh or not media_changed(url, entry, policy)):
+            updated[url] = entry
+            continue
+        if entry:
+            metadata.pop(url, None)
+            cache_path_for(url).unlink(missing_ok=True)
+        cooldown = 0 if refresh else failure_cooldown
+        if not ensure_media_dimensions(url, metadata, policy, failure_cooldown=cooldown):
+            if entry:
+                updated[url] = entry
+            failed.append(url)
+            continue
+        updated[url] = lock_entry_from_metadata(metadata[url])
+    return updated, failed
+
+
+def apply_locked_media(entry: Dict[str, Any], locked: Dict[str, Any]) -> bool:
+    """Copy locked dimensions and renditions onto ``entry``; return whether it has dimensions."""
+    if locked.get("renditions") and best_media_source(entry) == entry.get("previewSource"):
+        entry["previewRenditions"] = locked["renditions"]
+    if locked.get("width") and locked.get("height"):
+        entry["mediaWidth"] = locked["width"]
+        entry["mediaHeight"] = locked["height"]
+        return True
+    return False
+
+
+def apply_locked_dimensions(works: List[Dict[str, Any]], lock: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Copy locked metadata onto ``works``; return (file, url) pairs not in the lock."""
+    unlocked: List[Tuple[str, str]] = []
+    for entry in works:
+        source = best_media_source(entry)
+        if not source:
+            continue
+        locked = lock.get(source)
+        if locked is None:
+            unlocked.append((entry["file"], source))
+            continue
+        apply_locked_media(entry, locked)
+    return unlocked
+
+
+def ensure_cached_media(
+    url: str, metadata: MediaStore, policy: FetchPolicy
+) -> Optional[Tuple[Path, str]]:
+    """Return the blob path and content hash for ``url``, downloading it if needed."""
+    cached = metadata.get(url) or {}
+    if cached.get("contentHash") and cached.get("path") and Path(cached["path"]).exists():
+        return Path(cached["path"]), cached["contentHash"]
+    try:
+        blob, content_hash, validators = fetch_media_blob(url, policy)
+    except FetchError:
+        return None
+    if cached.get("width"):
+        metadata[url] = dict(cached, path=str(blob), contentHash=content_hash, **validators)
+    return blob, content_hash
+
+
+def build_renditions(
+    works: List[Dict[str, Any]],
+    lock: Dict[str, Any],
+    metadata: MediaStore,
+    policy: FetchPolicy,
+    *,
+    base_url: str,
+    workers: Optional[int] = None,
+) -> List[str]:
+    """Encode the rendition ladder for every video preview and record it in ``lock``.
+
+    Outputs are written under ``RENDITIONS_DIR`` and recorded with URLs below
+    ``base_url``; uploading the directory there is up to the caller.
+    Returns a list of human-readable problems; an empty list means success.
+    """
+    problems: List[str] = []
+    planned: Dict[str, List[Any]] = {}
+    for entry in works:
+        url = entry.get("previewSource")
+        if not url or url in planned or infer_media_kind_from_url(url) != "video":
+            continue
+        locked = lock.get(url)
+        if not (locked and locked.get("width") and locked.get("height")):
+            if not ensure_media_dimensions(url, metadata, policy):
+                problems.append(f"{entry['file']}: no dimensions for {url}")
+                continue
+            locked = lock_entry_from_metadata(metadata[url])
+            lock[url] = locked
+        cached = ensure_cached_media(url, metadata, policy)
+        if cached is None:
+            problems.append(f"{entry['file']}: could not download {url}")
+            continue
+        source_path, content_hash = cached
+        locked["sha256"] = content_hash
+        planned[url] = plan_renditions(
+            source_path, locked["width"], locked["height"], RENDITIONS_DIR, content_hash
+        )
 
+    jobs = [job for url_jobs in planned.values() for job in url_jobs]
+    errors = run_jobs(jobs, workers)
+    for url, url_jobs in planned.items():
+        renditions = []
+        for job in url_jobs:
+            error = errors.get(str(job.output))
+            if error:
+                problems.append(f"{url} ({min(job.width, job.height)}p): {error}")
+                continue
+            renditions.append(describe_rendition(job, RENDITIONS_DIR, base_url))
+        lock[url]["renditions"] = sorted(renditions, key=lambda item: item["width"])
+    return problems
+
+
+def feed_sort_time(entry: Dict[str, Any]) -> float:
+    # Same as `Date.parse(a.issued ?? a.created ?? '') || 0` in the feed.
+    value = entry.get("issued")
+    if value is None:
+        value = entry.get("created")
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def feed_works(works: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the works the feed page shows, newest first, in the feed's order."""
+    # sorted() is stable with reverse=True, like Array.prototype.sort in the feed.
+    return sorted(works, key=feed_sort_time, reverse=True)[:FEED_WORK_LIMIT]
+
+
+def asset_size(url: str, lock: Dict[str, Any], metadata: MediaStore) -> Optional[int]:
+    for source in (lock.get(url), metadata.get(url)):
+        if source and source.get("size") is not None:
+            return int(source["size"])
     return None
 
 
-def main() -> None:
+def select_rendition(
+    renditions: List[Dict[str, Any]],
+    width: int,
+    height: int,
+    viewport: Tuple[int, int],
+    device_pixel_ratio: float,
+) -> Optional[Dict[str, Any]]:
+    """Mirror selectRendition() in the feed page; None means the original is served.
+
+    The feed shows a video at its natural size, limited to the viewport, so
+    the target is the width the ``width`` x ``height`` original is displayed at.
+    """
+    viewport_width, viewport_height = viewport
+    displayed_width = min(width, viewport_width, viewport_height * width / height)
+    target_width = displayed_width * device_pixel_ratio
+    for rendition in sorted(renditions, key=lambda item: item["width"]):
+        if rendition["width"] >= target_width:
+            return rendition
+    return None
+
+
+def served_asset(
+    entry: Dict[str, Any],
+    url: str,
+    lock: Dict[str, Any],
+    viewport: Tuple[int, int],
+    device_pixel_ratio: float,
+) -> Optional[Dict[str, Any]]:
+    """Return the rendition the feed serves for ``entry`` at the given viewport, if any."""
+    if url != entry.get("previewSource") or infer_media_kind_from_url(url) != "video":
+        return None
+    locked = lock.get(url) or {}
+    renditions = locked.get("renditions") or []
+    if not (renditions and locked.get("width") and locked.get("height")):
+        return None
+    return select_rendition(renditions, locked["width"], locked["height"], viewport, device_pixel_ratio)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def report_feed_budget(
+    works: List[Dict[str, Any]],
+    lock: Dict[str, Any],
+    metadata: MediaStore,
+    *,
+    total_budget: Optional[int] = None,
+    asset_budget: Optional[int] = None,
+    viewport: Tuple[int, int] = (DEFAULT_VIEWPORT_WIDTH, DEFAULT_VIEWPORT_HEIGHT),
+    device_pixel_ratio: float = DEFAULT_DEVICE_PIXEL_RATIO,
+) -> List[str]:
+    """Print the feed's preview byte weight and return budget violations.
+
+    Sizes are those of the files the feed serves at ``viewport`` (CSS width,
+    height) and ``device_pixel_ratio``: a preview rendition where one covers
+    the original's displayed width, otherwise the original. Budgets apply to
+    these served sizes, and an asset of unknown size violates any budget.
+    """
+    sized: List[Tuple[int, Dict[str, Any], str]] = []
+    unknown: List[Tuple[Dict[str, Any], str]] = []
+    original_total = 0
+    for entry in feed_works(works):
+        url = best_media_source(entry)
+        if not url:
+            continue
+        original = asset_size(url, lock, metadata)
+        rendition = served_asset(entry, url, lock, viewport, device_pixel_ratio)
+        size = int(rendition["size"]) if rendition else original
+        if size is None:
+            unknown.append((entry, url))
+            continue
+        original_total += original if original is not None else size
+        sized.append((size, entry, rendition["src"] if rendition else url))
+
+    total = sum(size for size, _, _ in sized)
+    print(
+        f"Feed preview weight at a {viewport[0]}x{viewport[1]} viewport, "
+        f"{device_pixel_ratio:g}x pixel ratio: "
+        f"{format_bytes(total)} served across {len(sized)} assets "
+        f"({format_bytes(original_total)} as originals)."
+    )
+    for size, entry, url in sorted(sized, key=lambda item: item[0], reverse=True)[:BUDGET_TOP_ASSETS]:
+        share = size / total * 100 if total else 0
+        print(f"  {format_bytes(size):>10}  {share:5.1f}%  {entry['file']}")
+    if unknown:
+        print(f"{len(unknown)} asset(s) have no recorded size; run the 'lock' command:")
+        for entry, url in unknown:
+            print(f"  {entry['file']}: {url}")
+
+    violations: List[str] = []
+    if total_budget is not None and total > total_budget:
+        violations.append(
+            f"Feed preview weight {format_bytes(total)} exceeds budget of {format_bytes(total_budget)}."
+        )
+    if asset_budget is not None:
+        for size, entry, url in sized:
+            if size > asset_budget:
+                violations.append(
+                    f"{entry['file']}: {format_bytes(size)} exceeds per-asset budget of "
+                    f"{format_bytes(asset_budget)} ({url})."
+                )
+    if total_budget is not None or asset_budget is not None:
+        # An asset of unknown size cannot be shown to fit, so it fails the budget.
+        for entry, url in unknown:
+            violations.append(f"{entry['file']}: size of {url} is unknown, so the budget cannot be checked.")
+    return violations
+
+
+def write_work_shards(works: List[Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+    """Write one JSON file per work plus a slug -> {file, hash} manifest.
+
+    Shard names embed a hash of their contents, so they can be cached
+    indefinitely; shards left over from previous builds are removed.
+    """
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    manifest: Dict[str, Dict[str, str]] = {}
+    written = set()
+    for entry in works:
+        payload = json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:SHARD_HASH_LENGTH]
+        name = f"{Path(entry['file']).stem}.{digest}.json"
+        shard_path = SHARDS_DIR / name
+        if not shard_path.exists():
+            shard_path.write_text(payload, encoding="utf-8")
+        written.add(name)
+        if entry.get("slug"):
+            manifest[str(entry["slug"])] = {"file": name, "hash": digest}
+    for stale in SHARDS_DIR.glob("*.json"):
+        if stale.name not in written:
+            stale.unlink()
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=("build", "lock", "renditions", "budget"),
+        default="build",
+        help=(
+            "'build' writes the works index (default); 'lock' refreshes media-lock.json; "
+            "'renditions' encodes preview renditions and records them in the lockfile; "
+            "'budget' reports the feed page's preview byte weight."
+        ),
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Build using only media-lock.json; fail if a work references an unlocked URL.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="With 'lock', revalidate existing entries and re-probe changed media.",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help="Seconds to wait for a connection to a media host (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=DEFAULT_READ_TIMEOUT,
+        help="Seconds to wait between bytes of a media response (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help="Retries for transient fetch errors, with jittered backoff (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Total seconds the build may spend fetching media; remaining assets are skipped.",
+    )
+    parser.add_argument(
+        "--failure-cooldown",
+        type=float,
+        default=DEFAULT_FAILURE_COOLDOWN,
+        help="Seconds before a failed asset is fetched again (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="With 'renditions', number of parallel encoder processes (default: CPU count).",
+    )
+    parser.add_argument(
+        "--renditions-base-url",
+        default=None,
+        help="With 'renditions' (required), absolute URL under which computed/renditions is uploaded.",
+    )
+    parser.add_argument(
+        "--budget-total-mb",
+        type=float,
+        default=None,
+        help="With 'budget', fail if the feed's previews exceed this many megabytes in total.",
+    )
+    parser.add_argument(
+        "--budget-asset-mb",
+        type=float,
+        default=None,
+        help="With 'budget', fail if any single feed preview exceeds this many megabytes.",
+    )
+    parser.add_argument(
+        "--viewport-width",
+        type=int,
+        default=DEFAULT_VIEWPORT_WIDTH,
+        help="With 'budget', CSS viewport width used to pick renditions (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--viewport-height",
+        type=int,
+        default=DEFAULT_VIEWPORT_HEIGHT,
+        help="With 'budget', CSS viewport height used to pick renditions (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--device-pixel-ratio",
+        type=float,
+        default=DEFAULT_DEVICE_PIXEL_RATIO,
+        help="With 'budget', device pixel ratio used to pick renditions (default: %(default)s).",
+    )
+    return parser.parse_args(argv)
+
+
+def megabytes(value: Optional[float]) -> Optional[int]:
+    return int(value * 1024 * 1024) if value is not None else None
+
+
+def policy_from_args(args: argparse.Namespace) -> FetchPolicy:
+    return FetchPolicy(
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        retries=args.retries,
+        backoff=DEFAULT_BACKOFF,
+        time_budget=args.time_budget,
+    )
+
+
+def describe_failure(url: str, metadata: MediaStore, policy: FetchPolicy) -> str:
+    cached = metadata.get(url) or {}
+    if cached.get("error"):
+        return f"{url}: {cached['error']}"
+    if policy.expired():
+        return f"{url}: skipped, time budget exhausted"
+    return url
+
+
+def run_lock(works: List[Dict[str, Any]], media_metadata: MediaStore, args: argparse.Namespace) -> None:
+    policy = policy_from_args(args)
+    lock, failed = lock_media(
+        works,
+        read_media_lock_or_exit(),
+        media_metadata,
+        policy,
+        refresh=args.refresh,
+        failure_cooldown=args.failure_cooldown,
+    )
+    save_media_lock(lock)
+    print(f"Wrote {MEDIA_LOCK_PATH.relative_to(ROOT)} with {len(lock)} entries.")
+    if failed:
+        for url in failed:
+            print(f"Could not probe {describe_failure(url, media_metadata, policy)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_renditions(
+    works: List[Dict[str, Any]], media_metadata: MediaStore, args: argparse.Namespace
+) -> None:
+    if not ffmpeg_available():
+        print("ffmpeg is required to encode renditions.", file=sys.stderr)
+        sys.exit(1)
+    base_url = args.renditions_base_url
+    if not base_url or urlsplit(base_url).scheme not in ("http", "https"):
+        print(
+            "--renditions-base-url must be the absolute http(s) URL that "
+            f"{RENDITIONS_DIR.relative_to(ROOT)} is uploaded to.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    lock = read_media_lock_or_exit()
+    problems = build_renditions(
+        works,
+        lock,
+        media_metadata,
+        policy_from_args(args),
+        base_url=base_url,
+        workers=args.workers,
+    )
+    save_media_lock(lock)
+    count = sum(len(entry.get("renditions", [])) for entry in lock.values())
+    print(f"Recorded {count} renditions in {MEDIA_LOCK_PATH.relative_to(ROOT)}.")
+    print(f"Upload {RENDITIONS_DIR.relative_to(ROOT)}/ to {base_url} before committing the lockfile.")
+    if problems:
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    with open_media_metadata() as media_metadata:
+        run(args, media_metadata)
+
+
+def run(args: argparse.Namespace, media_metadata: MediaStore) -> None:
     try:
-        works = collect_works()
+        works = collect_works(parse_cache=media_metadata)
     except Exception as err:
         print(f"Failed to collect works: {err}", file=sys.stderr)
         sys.exit(1)
 
-    media_metadata = load_media_metadata()
-
-    for entry in works:
-        source = best_media_source(entry)
-        dimensions = ensure_media_dimensions(source, media_metadata)
-        if dimensions:
-            width, height = dimensions
-            entry["mediaWidth"] = width
-            entry["mediaHeight"] = height
+    if args.command == "lock":
+        run_lock(works, media_metadata, args)
+        return
+    if args.command == "renditions":
+        run_renditions(works, media_metadata, args)
+        return
+    if args.command == "budget":
+        violations = report_feed_budget(
+            works,
+            read_media_lock_or_exit(),
+            media_metadata,
+            total_budget=megabytes(args.budget_total_mb),
+            asset_budget=megabytes(args.budget_asset_mb),
+            viewport=(args.viewport_width, args.viewport_height),
+            device_pixel_ratio=args.device_pixel_ratio,
+        )
+        for violation in violations:
+            print(violation, file=sys.stderr)
+        sys.exit(1 if violations else 0)
+
+    media_lock = read_media_lock_or_exit()
+
+    if args.offline:
+        unlocked = apply_locked_dimensions(works, media_lock)
+        if unlocked:
+            print(
+                f"{len(unlocked)} media URL(s) missing from {MEDIA_LOCK_PATH.relative_to(ROOT)}; "
+                "run 'python3 scripts/build_work_index.py lock' and commit the result:",
+                file=sys.stderr,
+            )
+            for file, url in unlocked:
+                print(f"  {file}: {url}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        policy = policy_from_args(args)
+        missing: List[str] = []
+        for entry in works:
+            source = best_media_source(entry)
+            locked = media_lock.get(source) if source else None
+            if locked and apply_locked_media(entry, locked):
+                continue
+            dimensions = ensure_media_dimensions(
+                source, media_metadata, policy, failure_cooldown=args.failure_cooldown
+            )
+            if source and not dimensions:
+                missing.append(source)
+            if dimensions:
+                width, height = dimensions
+                entry["mediaWidth"] = width
+                entry["mediaHeight"] = height
+        for url in missing:
+            print(f"No dimensions for {describe_failure(url, media_metadata, policy)}", file=sys.stderr)
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     OUTPUT_PATH.write_text(json.dumps(works, indent=2), encoding="utf-8")
-    save_media_metadata(media_metadata)
+    manifest = write_work_shards(works)
+    save_value_indexes(build_value_indexes(works), VALUES_INDEX_PATH)
     print(f"Wrote {OUTPUT_PATH.relative_to(ROOT)} with {len(works)} entries.")
+    print(f"Wrote {len(manifest)} work shards and {MANIFEST_PATH.relative_to(ROOT)}.")
 
 
 if __name__ == "__main__":
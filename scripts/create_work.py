@@ -13,10 +13,11 @@ import re
 import sys
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parent.parent
 WORKS_DIR = ROOT / "docs" / "works"
+VALUES_INDEX_PATH = ROOT / "computed" / "work-values-index.json"
 
 
 class Field:
@@ -35,15 +36,25 @@ class Field:
         self.default = default
         self.transform = transform
 
-    def prompt(self) -> Any:
+    def prompt(
+        self,
+        *,
+        hint: Optional[str] = None,
+        complete: Optional[Callable[[str], List[str]]] = None,
+    ) -> Any:
         while True:
             suffix: List[str] = []
             if self.required:
                 suffix.append("required")
             if self.default is not None:
                 suffix.append(f"default: {self.default}")
+            if hint:
+                suffix.append(hint)
             prompt_suffix = f" ({', '.join(suffix)})" if suffix else ""
-            value = input(f"{self.label}{prompt_suffix}: ").strip()
+            if complete is not None:
+                value = prompt_with_completions(f"{self.label}{prompt_suffix}", complete).strip()
+            else:
+                value = input(f"{self.label}{prompt_suffix}: ").strip()
 
             if not value:
                 if self.default is not None:
@@ -171,7 +182,9 @@ def prompt_slug(title: Optional[str]) -> str:
         if not value:
             value = suggestion
         try:
-            return normalize_slug(value)
+            slug = normalize_slug(value)
+            slug_location(slug)
+            return slug
         except ValueError as err:
             print(f"{err}. Please try again.")
 
@@ -251,6 +264,116 @@ def prompt_choice(label: str, options: List[str], *, allow_skip: bool = False) -
         print("Invalid selection. Try again.")
 
 
+_CURSES_UNAVAILABLE = False
+
+
+def prompt_with_completions(label: str, complete: Callable[[str], List[str]]) -> str:
+    """Read a line of text while showing ranked completions from the corpus.
+
+    Tab accepts the highlighted (or top) suggestion, arrow keys move the
+    highlight and Enter confirms. Falls back to plain input() without curses.
+    """
+    global _CURSES_UNAVAILABLE
+
+    def _editor(stdscr: Any) -> str:
+        curses.curs_set(1)
+        text = ""
+        index = -1
+        while True:
+            suggestions = complete(text)
+            index = min(index, len(suggestions) - 1)
+            rows, columns = stdscr.getmaxyx()
+            prefix = f"{label}: "
+            # Scroll the input horizontally so the cursor stays on screen.
+            visible = max(1, columns - 1 - len(prefix))
+            shown = text[-visible:] if len(text) > visible else text
+            suggestions = suggestions[: max(0, rows - 4)]
+            index = min(index, len(suggestions) - 1)
+            stdscr.erase()
+            stdscr.addnstr(0, 0, prefix + shown, columns - 1)
+            for offset, suggestion in enumerate(suggestions):
+                attributes = curses.A_REVERSE if offset == index else curses.A_NORMAL
+                stdscr.addnstr(offset + 2, 2, suggestion, max(0, columns - 3), attributes)
+            if len(suggestions) + 3 < rows:
+                stdscr.addnstr(
+                    len(suggestions) + 3, 0, "Tab: complete  Up/Down: choose  Enter: confirm", columns - 1
+                )
+            stdscr.move(0, min(len(prefix) + len(shown), columns - 1))
+            stdscr.refresh()
+            key = stdscr.get_wch()
+            if key in ("\n", "\r", curses.KEY_ENTER):
+                return suggestions[index] if index >= 0 else text
+            if key == "\t":
+                if suggestions:
+                    text = suggestions[max(index, 0)]
+                    index = -1
+            elif key == curses.KEY_UP:
+                index = max(-1, index - 1)
+            elif key == curses.KEY_DOWN:
+                index = min(len(suggestions) - 1, index + 1)
+            elif key in (curses.KEY_BACKSPACE, "\x7f", "\b"):
+                text = text[:-1]
+                index = -1
+            elif isinstance(key, str) and key.isprintable():
+                text += key
+                index = -1
+
+    if not _CURSES_UNAVAILABLE:
+        try:
+            value = curses.wrapper(_editor)
+            print(f"{label}: {value}")
+            return value
+        except curses.error:
+            _CURSES_UNAVAILABLE = True
+            print("Interactive completion unavailable; please type values manually.")
+        except Exception as err:  # fallback for terminals that cannot init curses
+            _CURSES_UNAVAILABLE = True
+            print(f"Interactive completion failed ({err}). Please type values manually.")
+
+    suggestions = complete("")
+    if suggestions:
+        print(f"Previously used: {', '.join(suggestions)}")
+    return input(f"{label}: ")
+
+
+def load_catalog() -> Optional[Any]:
+    # Imported lazily: work_catalog builds its records from FIELDS below.
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from scripts.media_store import MediaStore
+    from scripts.work_catalog import WorkCatalog
+
+    # Reuse the frontmatter parsed by earlier builds; only changed files are read.
+    with MediaStore.open() as parse_cache:
+        try:
+            return WorkCatalog.load(ROOT, WORKS_DIR, strict=False, parse_cache=parse_cache)
+        except FileNotFoundError:
+            return None
+
+
+def load_completion_indexes(catalog: Optional[Any]) -> Dict[str, Any]:
+    """Use the prefix index written by build_work_index.py, else build it from ``catalog``."""
+    from scripts.work_catalog import build_value_indexes, load_value_indexes
+
+    if VALUES_INDEX_PATH.exists():
+        try:
+            return load_value_indexes(VALUES_INDEX_PATH)
+        except (OSError, ValueError):
+            pass
+    if catalog is None:
+        return {}
+    return build_value_indexes([record.to_dict() for record in catalog])
+
+
+def next_sidebar_position(catalog: Optional[Any], directory: Path) -> int:
+    positions = [
+        record.sidebar_position
+        for record in (catalog or [])
+        if record.path.parent == directory and isinstance(record.sidebar_position, int)
+    ]
+    return max(positions, default=0) + 1
+
+
 def parse_sidebar_position(raw: str) -> int:
     try:
         position = int(raw)
@@ -318,7 +441,7 @@ def format_frontmatter_value(value: Any) -> str:
     return f'"{escaped}"'
 
 
-def slug_to_path(slug: str) -> Path:
+def slug_location(slug: str) -> Tuple[Path, str]:
     segments = [segment for segment in slug.strip("/").split("/") if segment]
     if not segments:
         raise ValueError("slug must contain at least one segment")
@@ -326,9 +449,11 @@ def slug_to_path(slug: str) -> Path:
         segments = segments[1:]
     if not segments:
         raise ValueError("slug must contain a segment after /works/")
-    filename_segments = segments[:-1]
-    basename = segments[-1]
-    target_dir = WORKS_DIR.joinpath(*filename_segments)
+    return WORKS_DIR.joinpath(*segments[:-1]), segments[-1]
+
+
+def slug_to_path(slug: str) -> Path:
+    target_dir, basename = slug_location(slug)
     target_dir.mkdir(parents=True, exist_ok=True)
     return target_dir / f"{basename}.md"
 
@@ -347,6 +472,8 @@ def build_frontmatter(metadata: Dict[str, Any]) -> str:
 def main() -> None:
     print("New Work Creator")
     print("================")
+    catalog = load_catalog()
+    completions = load_completion_indexes(catalog)
     metadata: Dict[str, Any] = {}
     for field in FIELDS:
         if field.transform is parse_date:
@@ -360,6 +487,12 @@ def main() -> None:
             metadata[field.key] = prompt_choice("Type", WORK_TYPE_OPTIONS)
         elif field.key == "format":
             metadata[field.key] = prompt_choice("Format", WORK_FORMAT_OPTIONS, allow_skip=True)
+        elif field.key == "sidebar_position":
+            target_dir, _ = slug_location(metadata["slug"])
+            next_position = next_sidebar_position(catalog, target_dir)
+            metadata[field.key] = field.prompt(hint=f"next free: {next_position}")
+        elif field.key in completions:
+            metadata[field.key] = field.prompt(complete=completions[field.key].complete)
         else:
             metadata[field.key] = field.prompt()
 
@@ -377,6 +510,10 @@ def main() -> None:
         print(f"Failed to determine file path: {err}", file=sys.stderr)
         sys.exit(1)
 
+    existing = catalog.by_slug(metadata["slug"]) if catalog is not None else None
+    if existing is not None and existing.path != target_path:
+        print(f"Warning: slug {metadata['slug']} is already used by {existing.path.relative_to(ROOT)}.")
+
     if target_path.exists():
         choice = input(f"{target_path} already exists. Overwrite? [y/N]: ").strip().lower()
         if choice not in {"y", "yes"}:
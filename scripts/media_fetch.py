@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Deadline-aware HTTP helpers for fetching remote media.
+
+Every request gets separate connect and read timeouts, transient failures are
+retried a bounded number of times with jittered exponential backoff, and an
+optional overall time budget caps how long a whole build may spend fetching.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import time
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection, InvalidURL
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import SplitResult, quote, urljoin, urlsplit
+
+DEFAULT_USER_AGENT = "hyperobjects-works-index/1.0"
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 1.0
+MAX_REDIRECTS = 5
+CHUNK_SIZE = 64 * 1024
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Characters left as-is when percent-encoding a request target; "%" keeps
+# already-encoded URLs unchanged.
+PATH_SAFE_CHARS = "/%:@!$&'()*+,;=-._~"
+QUERY_SAFE_CHARS = PATH_SAFE_CHARS + "?"
+
+T = TypeVar("T")
+
+
+class FetchError(Exception):
+    def __init__(self, message: str, *, retryable: bool = False, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+        self.status = status
+
+
+class BudgetExceeded(FetchError):
+    pass
+
+
+class FetchPolicy:
+    def __init__(
+        self,
+        *,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        time_budget: Optional[float] = None,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.deadline = time.monotonic() + time_budget if time_budget else None
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check_deadline(self) -> None:
+        if self.expired():
+            raise BudgetExceeded("build time budget exhausted")
+
+    def timeout(self, base: float) -> float:
+        """Clamp ``base`` so a single socket operation cannot overrun the budget."""
+        remaining = self.remaining()
+        if remaining is None:
+            return base
+        return max(0.1, min(base, remaining))
+
+    def backoff_delay(self, attempt: int) -> float:
+        # Full jitter: spreads retries from concurrent builds instead of syncing them.
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+
+def with_retries(policy: FetchPolicy, operation: Callable[[], T]) -> T:
+    attempt = 0
+    while True:
+        policy.check_deadline()
+        try:
+            return operation()
+        except BudgetExceeded:
+            raise
+        except FetchError as err:
+            if not err.retryable or attempt >= policy.retries:
+                raise
+        delay = policy.backoff_delay(attempt)
+        remaining = policy.remaining()
+        if remaining is not None and delay >= remaining:
+            raise BudgetExceeded("build time budget exhausted while backing off")
+        time.sleep(delay)
+        attempt += 1
+
+
+def network_error(err: Exception) -> FetchError:
+    """Wrap a socket or protocol error raised while talking to a server."""
+    return FetchError(f"{type(err).__name__}: {err}", retryable=True)
+
+
+def request_target(parts: SplitResult) -> str:
+    """Return the percent-encoded path and query to send for ``parts``."""
+    path = quote(parts.path or "/", safe=PATH_SAFE_CHARS)
+    if parts.query:
+        path = f"{path}?{quote(parts.query, safe=QUERY_SAFE_CHARS)}"
+    return path
+
+
+def open_url(
+    url: str,
+    policy: FetchPolicy,
+    *,
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+) -> Tuple[HTTPConnection, HTTPResponse]:
+    """Issue a single request, following redirects. The caller closes the connection.
+
+    Network failures become retryable ``FetchError``s; a URL that cannot be
+    requested at all becomes a non-retryable one.
+    """
+    request_headers = {"User-Agent": DEFAULT_USER_AGENT}
+    request_headers.update(headers or {})
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise FetchError(f"unsupported URL scheme '{parts.scheme}'")
+        connection_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+        try:
+            connection = connection_class(parts.netloc, timeout=policy.timeout(policy.connect_timeout))
+        except InvalidURL as err:
+            raise FetchError(f"invalid URL {url!r}: {err}") from err
+        try:
+            connection.connect()
+            connection.sock.settimeout(policy.timeout(policy.read_timeout))
+            connection.request(method, request_target(parts), headers=request_headers)
+            response = connection.getresponse()
+        except (InvalidURL, UnicodeError) as err:
+            connection.close()
+            raise FetchError(f"invalid URL {url!r}: {err}") from err
+        except (HTTPException, OSError) as err:
+            connection.close()
+            raise network_error(err) from err
+        except BaseException:
+            connection.close()
+            raise
+        location = response.getheader("Location")
+        if response.status in REDIRECT_STATUSES and location:
+            connection.close()
+            url = urljoin(url, location)
+            continue
+        return connection, response
+    raise FetchError(f"too many redirects for {url}")
+
+
+def raise_for_status(response: HTTPResponse) -> None:
+    if response.status >= 400:
+        retryable = response.status >= 500 or response.status == 429
+        raise FetchError(f"HTTP {response.status} {response.reason}", retryable=retryable, status=response.status)
+
+
+def extract_validators(response: HTTPResponse) -> Dict[str, str]:
+    validators: Dict[str, str] = {}
+    if response.getheader("ETag"):
+        validators["etag"] = response.getheader("ETag")
+    if response.getheader("Last-Modified"):
+        validators["lastModified"] = response.getheader("Last-Modified")
+    return validators
+
+
+def read_chunk(response: HTTPResponse) -> bytes:
+    try:
+        return response.read(CHUNK_SIZE)
+    except (HTTPException, OSError) as err:
+        raise network_error(err) from err
+
+
+def download(url: str, destination: Path, policy: FetchPolicy) -> Dict[str, str]:
+    """Stream ``url`` into ``destination`` atomically and return its validators."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    def attempt() -> Dict[str, str]:
+        connection, response = open_url(url, policy)
+        partial: Optional[Path] = None
+        try:
+            raise_for_status(response)
+            # A unique partial name per attempt keeps concurrent downloads apart.
+            descriptor, name = tempfile.mkstemp(
+                dir=destination.parent, prefix=f".{destination.name}.", suffix=".part"
+            )
+            partial = Path(name)
+            with os.fdopen(descriptor, "wb") as handle:
+                while True:
+                    policy.check_deadline()
+                    chunk = read_chunk(response)
+                    if not chunk:
+                        break
+                    handle.write(chunk)
+            os.replace(partial, destination)
+            return extract_validators(response)
+        finally:
+            connection.close()
+            if partial is not None:
+                partial.unlink(missing_ok=True)
+
+    return with_retries(policy, attempt)
+
+
+def head(url: str, policy: FetchPolicy, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str]]:
+    """Return the status and response headers of a HEAD request."""
+
+    def attempt() -> Tuple[int, Dict[str, str]]:
+        connection, response = open_url(url, policy, method="HEAD", headers=headers)
+        try:
+            if response.status >= 500 or response.status == 429:
+                raise_for_status(response)
+            return response.status, {key.lower(): value for key, value in response.getheaders()}
+        finally:
+            connection.close()
+
+    return with_retries(policy, attempt)
+
+
+def ranged_get(url: str, policy: FetchPolicy) -> Tuple[int, Dict[str, str]]:
+    """Request only the first byte of ``url``; for servers that reject HEAD."""
+
+    def attempt() -> Tuple[int, Dict[str, str]]:
+        connection, response = open_url(url, policy, headers={"Range": "bytes=0-0"})
+        try:
+            if response.status >= 500 or response.status == 429:
+                raise_for_status(response)
+            return response.status, {key.lower(): value for key, value in response.getheaders()}
+        finally:
+            connection.close()
+
+    return with_retries(policy, attempt)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Transcode preview videos into a ladder of smaller renditions.
+
+Each rung is encoded once per source file: outputs live under a directory
+named after the SHA-256 of the source bytes, so re-running the stage only
+encodes sources that changed. Encodes run in a process pool.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# (short side in pixels, target video bitrate)
+RENDITION_LADDER: List[Tuple[int, str]] = [
+    (360, "800k"),
+    (720, "2500k"),
+    (1080, "5000k"),
+]
+ENCODE_TIMEOUT = 15 * 60
+
+
+class RenditionJob:
+    __slots__ = ("source", "output", "width", "height", "bitrate")
+
+    def __init__(self, source: Path, output: Path, width: int, height: int, bitrate: str) -> None:
+        self.source = source
+        self.output = output
+        self.width = width
+        self.height = height
+        self.bitrate = bitrate
+
+    def to_args(self) -> Tuple[str, str, int, int, str]:
+        return str(self.source), str(self.output), self.width, self.height, self.bitrate
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def even(value: float) -> int:
+    return max(2, int(round(value / 2)) * 2)
+
+
+def scaled_size(width: int, height: int, short_side: int) -> Tuple[int, int]:
+    factor = short_side / min(width, height)
+    return even(width * factor), even(height * factor)
+
+
+def plan_renditions(
+    source: Path, width: int, height: int, output_dir: Path, content_hash: str
+) -> List[RenditionJob]:
+    """Return one job per ladder rung smaller than the source; never upscale."""
+    jobs: List[RenditionJob] = []
+    for short_side, bitrate in RENDITION_LADDER:
+        if short_side >= min(width, height):
+            continue
+        out_width, out_height = scaled_size(width, height, short_side)
+        output = output_dir / content_hash[:16] / f"{short_side}p.mp4"
+        jobs.append(RenditionJob(source, output, out_width, out_height, bitrate))
+    return jobs
+
+
+def encode_rendition(args: Tuple[str, str, int, int, str]) -> Tuple[str, Optional[str]]:
+    """Encode one rendition; return (output path, error or None)."""
+    source, output, width, height, bitrate = args
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = output_path.with_name(f".{output_path.name}.{os.getpid()}.part.mp4")
+    command = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-i",
+        source,
+        "-vf",
+        f"scale={width}:{height}",
+        "-c:v",
+        "libx264",
+        "-preset",
+        "slow",
+        "-b:v",
+        bitrate,
+        "-maxrate",
+        bitrate,
+        "-bufsize",
+        bitrate,
+        "-pix_fmt",
+        "yuv420p",
+        "-an",
+        "-movflags",
+        "+faststart",
+        str(partial),
+    ]
+    try:
+        subprocess.run(
+            command,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=ENCODE_TIMEOUT,
+        )
+        os.replace(partial, output_path)
+    except subprocess.CalledProcessError as err:
+        return output, err.stderr.strip() or f"ffmpeg exited with {err.returncode}"
+    except (subprocess.TimeoutExpired, OSError) as err:
+        return output, str(err)
+    finally:
+        partial.unlink(missing_ok=True)
+    return output, None
+
+
+def run_jobs(jobs: List[RenditionJob], workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """Encode every job whose output does not exist yet; return errors by output path."""
+    # Identical sources share a content hash, and therefore output paths.
+    pending = list({str(job.output): job for job in jobs if not job.output.exists()}.values())
+    results: Dict[str, Optional[str]] = {str(job.output): None for job in jobs}
+    if not pending:
+        return results
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for output, error in pool.map(encode_rendition, [job.to_args() for job in pending]):
+            results[output] = error
+    return results
+
+
+def describe_rendition(job: RenditionJob, output_dir: Path, base_url: str) -> Dict[str, Any]:
+    relative = job.output.relative_to(output_dir).as_posix()
+    return {
+        "src": f"{base_url.rstrip('/')}/{relative}",
+        "width": job.width,
+        "height": job.height,
+        "bitrate": job.bitrate,
+        "size": job.output.stat().st_size,
+    }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed cache for media metadata and parsed work frontmatter.
+
+Replaces the single computed/media-cache/metadata.json blob: every entry is
+committed on its own, so an interrupted build keeps the work it finished, and
+WAL mode lets concurrent builds read and write without clobbering each other.
+Probe results are keyed by the SHA-256 of the media bytes, so the same file
+reachable under several URLs is only probed once.
+
+Run directly to convert between the store and the JSON format:
+
+    python3 scripts/media_store.py export [metadata.json]
+    python3 scripts/media_store.py import [metadata.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+MEDIA_CACHE_DIR = ROOT / "computed" / "media-cache"
+MEDIA_DB_PATH = MEDIA_CACHE_DIR / "cache.sqlite3"
+LEGACY_METADATA_PATH = MEDIA_CACHE_DIR / "metadata.json"
+BUSY_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    url TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frontmatter (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    body_start INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS probes (
+    content_hash TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS link_checks (
+    url TEXT PRIMARY KEY,
+    checked_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+_MISSING = object()
+
+
+class MediaStore(MutableMapping):
+    """Dict-like view of the media metadata, one committed row per URL."""
+
+    def __init__(self, path: Path = MEDIA_DB_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, path: Path = MEDIA_DB_PATH, legacy_json: Path = LEGACY_METADATA_PATH) -> "MediaStore":
+        """Open the store, importing ``legacy_json`` the first time if it exists."""
+        store = cls(path)
+        if len(store) == 0 and legacy_json.exists():
+            try:
+                store.import_json(legacy_json)
+            except ValueError:
+                pass
+        return store
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "MediaStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def get(self, url: Optional[str], default: Any = None) -> Any:
+        row = self.connection.execute("SELECT data FROM media WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def __getitem__(self, url: str) -> Dict[str, Any]:
+        value = self.get(url, _MISSING)
+        if value is _MISSING:
+            raise KeyError(url)
+        return value
+
+    def __setitem__(self, url: str, value: Dict[str, Any]) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO media (url, data) VALUES (?, ?)", (url, json.dumps(value))
+        )
+
+    def __delitem__(self, url: str) -> None:
+        if url not in self:
+            raise KeyError(url)
+        self.connection.execute("DELETE FROM media WHERE url = ?", (url,))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self.connection.execute("SELECT url FROM media ORDER BY url")])
+
+    def __contains__(self, url: object) -> bool:
+        return self.connection.execute("SELECT 1 FROM media WHERE url = ?", (url,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+
+    def pop(self, url: str, default: Any = None) -> Any:
+        value = self.get(url, default)
+        self.connection.execute("DELETE FROM media WHERE url = ?", (url,))
+        return value
+
+    def rows(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for url, data in self.connection.execute("SELECT url, data FROM media ORDER BY url").fetchall():
+            yield url, json.loads(data)
+
+    def import_json(self, path: Path) -> int:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(payload, dict):
+            raise ValueError(f"{path} must contain a JSON object keyed by URL.")
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO media (url, data) VALUES (?, ?)",
+                ((url, json.dumps(value)) for url, value in payload.items()),
+            )
+        return len(payload)
+
+    def export_json(self, path: Path) -> int:
+        payload = dict(self.rows())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return len(payload)
+
+    def get_frontmatter(self, key: str, mtime_ns: int, size: int) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Return cached (metadata, body_start) if the file has not changed since it was parsed."""
+        row = self.connection.execute(
+            "SELECT data, body_start FROM frontmatter WHERE path = ? AND mtime_ns = ? AND size = ?",
+            (key, mtime_ns, size),
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put_frontmatter(
+        self, key: str, mtime_ns: int, size: int, metadata: Dict[str, Any], body_start: int
+    ) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO frontmatter (path, mtime_ns, size, body_start, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, mtime_ns, size, body_start, json.dumps(metadata)),
+        )
+
+    def get_probe(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Return probe results (dimensions) recorded for a blob's SHA-256."""
+        row = self.connection.execute(
+            "SELECT data FROM probes WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_probe(self, content_hash: str, probe: Dict[str, Any]) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO probes (content_hash, data) VALUES (?, ?)",
+            (content_hash, json.dumps(probe)),
+        )
+
+    def get_link_check(self, url: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """Return the cached link-check result for ``url`` if younger than ``max_age`` seconds."""
+        row = self.connection.execute(
+            "SELECT data FROM link_checks WHERE url = ? AND checked_at >= ?",
+            (url, time.time() - max_age),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_link_check(self, url: str, result: Dict[str, Any]) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO link_checks (url, checked_at, data) VALUES (?, ?, ?)",
+            (url, time.time(), json.dumps(result)),
+        )
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert the media cache to or from metadata.json.")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", nargs="?", type=Path, default=LEGACY_METADATA_PATH)
+    parser.add_argument("--db", type=Path, default=MEDIA_DB_PATH, help="SQLite store path.")
+    args = parser.parse_args(argv)
+
+    with MediaStore(args.db) as store:
+        if args.command == "export":
+            count = store.export_json(args.path)
+            print(f"Exported {count} entries to {args.path}.")
+        else:
+            try:
+                count = store.import_json(args.path)
+            except (OSError, ValueError) as err:
+                print(f"Failed to import {args.path}: {err}", file=sys.stderr)
+                sys.exit(1)
+            print(f"Imported {count} entries from {args.path}.")
+
+
+if __name__ == "__main__":
+    main()
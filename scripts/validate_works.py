@@ -16,7 +16,12 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 from scripts.create_work import (
     FIELDS as CREATE_FIELDS,
@@ -28,6 +33,9 @@ from scripts.create_work import (
     parse_date,
     parse_sidebar_position,
 )
+from scripts.media_fetch import FetchError, FetchPolicy, head, ranged_get
+from scripts.media_store import MEDIA_DB_PATH, MediaStore
+from scripts.work_catalog import WorkCatalog, WorkRecord, page_routes
 
 WORKS_DIR = ROOT / "docs" / "works"
 
@@ -35,45 +43,14 @@ FIELD_MAP = {field.key: field for field in CREATE_FIELDS}
 REQUIRED_FIELDS = {field.key for field in CREATE_FIELDS if field.required} | {"slug"}
 INT_FIELDS = {"sidebar_position"}
 DATE_FIELDS = {"created", "issued"}
-
-
-def read_frontmatter(markdown_path: Path) -> Tuple[Dict[str, Any], List[str]]:
-    text = markdown_path.read_text(encoding="utf-8")
-    lines = text.splitlines()
-    if not lines or lines[0].strip() != "---":
-        raise ValueError(f"{markdown_path} missing frontmatter start marker '---'.")
-
-    data_lines: List[str] = []
-    end_idx = None
-    for idx, line in enumerate(lines[1:], start=1):
-        if line.strip() == "---":
-            end_idx = idx
-            break
-        data_lines.append(line)
-
-    if end_idx is None:
-        raise ValueError(f"{markdown_path} missing frontmatter end marker '---'.")
-
-    metadata: Dict[str, Any] = {}
-    for raw in data_lines:
-        line = raw.strip()
-        if not line or line.startswith("#"):
-            continue
-        if ":" not in line:
-            raise ValueError(f"Malformed frontmatter line '{raw}' in {markdown_path}.")
-        key, value = line.split(":", 1)
-        key = key.strip()
-        value = value.strip()
-        if not key:
-            raise ValueError(f"Empty frontmatter key in line '{raw}' ({markdown_path}).")
-        if value.startswith('"') and value.endswith('"'):
-            processed = value[1:-1].replace(r'\"', '"').replace(r"\\", "\\")
-        else:
-            processed = value
-        metadata[key] = processed
-
-    body_lines = lines[end_idx + 1 :]
-    return metadata, body_lines
+MEDIA_FIELDS = ("fileSource", "previewSource", "staticPreviewSource", "source")
+LINK_CHECK_TTL = 24 * 60 * 60
+LINK_CHECK_CONCURRENCY = 32
+# Requests per second to any one host; different hosts are limited separately.
+LINK_CHECK_RATE = 50.0
+LINK_CHECK_MAX_RATE = 200.0
+# Statuses after which a HEAD answer is not trusted and a ranged GET is tried.
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
 
 
 def prompt_choice(label: str, options: List[str], allow_blank: bool = False) -> Optional[str]:
@@ -210,6 +187,167 @@ def validate_metadata(metadata: Dict[str, Any], path: Path) -> Dict[str, Any]:
     return updated if changed else metadata
 
 
+def check_integrity(catalog: WorkCatalog, routes: Optional[Set[str]] = None) -> List[str]:
+    """Report corpus-level problems that no single file can reveal on its own.
+
+    Covers duplicate slugs, duplicate sidebar_position values within one
+    directory and relations that point at neither a work nor another page of
+    the site, such as a series index. ``routes`` defaults to ``page_routes()``.
+    """
+    issues: List[str] = []
+    if routes is None:
+        routes = page_routes()
+
+    for slug, records in catalog.slugs().items():
+        if len(records) > 1:
+            paths = ", ".join(catalog.relative_path(record) for record in records)
+            issues.append(f"Duplicate slug '{slug}' used by {paths}.")
+
+    positions: Dict[Tuple[Path, str], List[WorkRecord]] = {}
+    for record in catalog:
+        if record.sidebar_position is None:
+            continue
+        key = (record.path.parent, str(record.sidebar_position))
+        positions.setdefault(key, []).append(record)
+    for (directory, position), records in positions.items():
+        if len(records) > 1:
+            paths = ", ".join(catalog.relative_path(record) for record in records)
+            issues.append(
+                f"Duplicate sidebar_position {position} in {directory.relative_to(ROOT)}: {paths}."
+            )
+
+    for record in catalog:
+        relation = record.relation
+        if not relation or not str(relation).startswith("/"):
+            continue
+        target = str(relation).rstrip("/") or "/"
+        if catalog.by_slug(target) is None and target not in routes:
+            issues.append(
+                f"Relation '{relation}' in {catalog.relative_path(record)} does not match any page slug."
+            )
+
+    return issues
+
+
+class RateLimiter:
+    """Spaces out calls across threads to at most ``rate`` per second per host."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slots: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slots.get(host, now))
+            self.next_slots[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def collect_media_urls(catalog: WorkCatalog) -> Dict[str, List[str]]:
+    """Map every distinct remote media URL to the 'file: field' places using it."""
+    urls: Dict[str, List[str]] = {}
+    for record in catalog:
+        for key in MEDIA_FIELDS:
+            value = record.get(key)
+            if isinstance(value, str) and value.startswith(("http://", "https://")):
+                urls.setdefault(value, []).append(f"{catalog.relative_path(record)}: {key}")
+    return urls
+
+
+def content_size(headers: Dict[str, str]) -> Optional[int]:
+    content_range = headers.get("content-range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    length = headers.get("content-length", "")
+    return int(length) if length.isdigit() else None
+
+
+def check_link(url: str, policy: FetchPolicy, limiter: RateLimiter) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"method": "HEAD"}
+    try:
+        limiter.wait(url)
+        status, headers = head(url, policy)
+        if status in HEAD_FALLBACK_STATUSES:
+            limiter.wait(url)
+            result["method"] = "GET"
+            status, headers = ranged_get(url, policy)
+    except FetchError as err:
+        result.update(ok=False, status=err.status, error=str(err))
+        return result
+    except ValueError as err:
+        # A URL the HTTP client rejects outright is reported as broken, not raised.
+        result.update(ok=False, status=None, error=f"invalid URL: {err}")
+        return result
+    size = content_size(headers) if status != 206 or "content-range" in headers else None
+    result.update(
+        ok=200 <= status < 300,
+        status=status,
+        contentType=headers.get("content-type"),
+        size=size,
+    )
+    return result
+
+
+def check_links(
+    catalog: WorkCatalog,
+    store: MediaStore,
+    *,
+    concurrency: int = LINK_CHECK_CONCURRENCY,
+    rate: float = LINK_CHECK_RATE,
+    ttl: float = LINK_CHECK_TTL,
+) -> Dict[str, Dict[str, Any]]:
+    """Check every distinct media URL once, reusing results younger than ``ttl``.
+
+    Requests run on a thread pool; the store is only touched from this thread.
+    """
+    urls = collect_media_urls(catalog)
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []
+    for url in urls:
+        cached = store.get_link_check(url, ttl)
+        if cached is not None:
+            results[url] = dict(cached, cached=True)
+        else:
+            pending.append(url)
+
+    policy = FetchPolicy(connect_timeout=5.0, read_timeout=10.0, retries=1)
+    limiter = RateLimiter(rate)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for url, result in zip(pending, pool.map(lambda url: check_link(url, policy, limiter), pending)):
+            # Only cache answers from the server, so network blips are rechecked next run.
+            if result.get("status") is not None:
+                store.put_link_check(url, result)
+            results[url] = result
+
+    for url, result in results.items():
+        result["usedBy"] = urls[url]
+    return results
+
+
+def report_links(results: Dict[str, Dict[str, Any]]) -> int:
+    broken = 0
+    for url in sorted(results):
+        result = results[url]
+        size = result.get("size")
+        size_text = f"{size} B" if size is not None else "size unknown"
+        status = result.get("status") or "-"
+        marker = "ok " if result.get("ok") else "BAD"
+        detail = result.get("error") or f"{result.get('contentType') or 'unknown type'}, {size_text}"
+        print(f"{marker} {status} {url} ({detail})")
+        if not result.get("ok"):
+            broken += 1
+            for place in result["usedBy"]:
+                print(f"      used by {place}")
+    print(f"\nChecked {len(results)} media URLs, {broken} broken.")
+    return broken
+
+
 def write_markdown(path: Path, metadata: Dict[str, Any], body_lines: List[str]) -> None:
     frontmatter_lines: List[str] = ["---"]
     for key in FRONTMATTER_ORDER:
@@ -224,32 +362,101 @@ def write_markdown(path: Path, metadata: Dict[str, Any], body_lines: List[str])
     path.write_text(content.rstrip() + "\n", encoding="utf-8")
 
 
-def main() -> None:
-    if not WORKS_DIR.exists():
-        print(f"Works directory not found: {WORKS_DIR}", file=sys.stderr)
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--integrity-only",
+        action="store_true",
+        help="Only run the non-interactive cross-file checks; exit non-zero on any issue.",
+    )
+    parser.add_argument(
+        "--check-links",
+        action="store_true",
+        help="Check that every media URL resolves; exit non-zero if any is broken.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=LINK_CHECK_CONCURRENCY,
+        help="Parallel link-check requests (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=LINK_CHECK_RATE,
+        help=(
+            "Maximum link-check requests per second to each host, at most "
+            f"{LINK_CHECK_MAX_RATE:g} (default: %(default)s)."
+        ),
+    )
+    parser.add_argument(
+        "--link-cache-ttl",
+        type=float,
+        default=LINK_CHECK_TTL,
+        help="Seconds a cached link-check result stays valid; 0 rechecks all (default: %(default)s).",
+    )
+    args = parser.parse_args(argv)
+    if not 0 < args.rate <= LINK_CHECK_MAX_RATE:
+        parser.error(f"--rate must be between 0 and {LINK_CHECK_MAX_RATE:g}")
+    return args
+
+
+def report_integrity(catalog: WorkCatalog) -> List[str]:
+    issues = check_integrity(catalog)
+    for md_path, message in catalog.errors:
+        issues.append(f"{md_path.relative_to(ROOT)}: {message}")
+    if issues:
+        print(f"Found {len(issues)} integrity issue(s):")
+        for issue in issues:
+            print(f"  - {issue}")
+    else:
+        print(f"Integrity check passed for {len(catalog)} work files.")
+    return issues
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    try:
+        catalog = WorkCatalog.load(ROOT, WORKS_DIR, strict=False)
+    except FileNotFoundError as err:
+        print(str(err), file=sys.stderr)
         sys.exit(1)
 
-    markdown_files = sorted(WORKS_DIR.rglob("*.md"))
-    processed = 0
+    if args.check_links or args.integrity_only:
+        failed = False
+        if args.integrity_only:
+            failed = bool(report_integrity(catalog))
+        if args.check_links:
+            with MediaStore(MEDIA_DB_PATH) as store:
+                results = check_links(
+                    catalog,
+                    store,
+                    concurrency=args.concurrency,
+                    rate=args.rate,
+                    ttl=args.link_cache_ttl,
+                )
+            failed = bool(report_links(results)) or failed
+        sys.exit(1 if failed else 0)
+
+    for md_path, message in catalog.errors:
+        print(f"\nChecking {md_path.relative_to(ROOT)}")
+        print(f"Error: {message}")
 
-    for md_path in markdown_files:
-        if md_path.name == "index.md":
-            continue
+    processed = 0
+    for record in catalog:
+        md_path = record.path
         print(f"\nChecking {md_path.relative_to(ROOT)}")
-        try:
-            metadata, body_lines = read_frontmatter(md_path)
-        except ValueError as err:
-            print(f"Error: {err}")
-            continue
+        metadata = record.to_dict()
         updated = validate_metadata(metadata, md_path)
         if updated != metadata:
-            write_markdown(md_path, updated, body_lines)
+            write_markdown(md_path, updated, record.body_lines)
             print("Updated file.")
         else:
             print("No changes needed.")
         processed += 1
 
-    print(f"\nProcessed {processed} work files.")
+    print(f"\nProcessed {processed} work files.\n")
+    report_integrity(WorkCatalog.load(ROOT, WORKS_DIR, strict=False))
 
 
 if __name__ == "__main__":
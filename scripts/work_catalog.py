@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+In-process catalog of the works defined under docs/works.
+
+Scans the tree once, parses every frontmatter block into a compact record and
+keeps hash indexes by slug, file path and subject plus a sorted index by issued
+date. Markdown bodies are only read when a caller asks for them.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from scripts.create_work import FIELDS
+from scripts.media_store import MediaStore
+
+DOCS_DIR = ROOT / "docs"
+WORKS_DIR = DOCS_DIR / "works"
+PAGES_DIR = ROOT / "src" / "pages"
+PAGE_EXTENSIONS = (".md", ".mdx", ".js", ".jsx", ".ts", ".tsx")
+# Docusaurus drops "01-" style prefixes from doc paths without an explicit slug.
+NUMBER_PREFIX = re.compile(r"^\d+\s*[-_.]+\s*(?=[^-_.\s])")
+
+FIELD_KEYS: Tuple[str, ...] = tuple(field.key for field in FIELDS)
+COMPLETION_FIELDS: Tuple[str, ...] = ("creator", "contributor", "subject", "publisher", "rights")
+
+
+def parse_frontmatter_value(value: str) -> Any:
+    if value.startswith('"') and value.endswith('"'):
+        return value[1:-1].replace(r'\"', '"').replace(r"\\", "\\")
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def read_frontmatter_block(markdown_path: Path) -> Tuple[Dict[str, Any], int]:
+    """Parse the frontmatter of ``markdown_path`` without reading its body.
+
+    Returns the metadata in file order and the index of the first body line.
+    """
+    front_lines: List[str] = []
+    end_index = None
+    with markdown_path.open(encoding="utf-8") as handle:
+        first = handle.readline()
+        if first.strip() != "---":
+            raise ValueError(f"{markdown_path} is missing frontmatter start marker '---'.")
+        for idx, line in enumerate(handle, start=1):
+            if line.strip() == "---":
+                end_index = idx
+                break
+            front_lines.append(line.rstrip("\r\n"))
+
+    if end_index is None:
+        raise ValueError(f"{markdown_path} is missing frontmatter end marker '---'.")
+
+    data: Dict[str, Any] = {}
+    for raw_line in front_lines:
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if ":" not in line:
+            raise ValueError(f"Unrecognized frontmatter line '{raw_line}' in {markdown_path}.")
+        key, value = line.split(":", 1)
+        key = key.strip()
+        if not key:
+            raise ValueError(f"Frontmatter key missing in line '{raw_line}' of {markdown_path}.")
+        data[key] = parse_frontmatter_value(value.strip())
+
+    return data, end_index + 1
+
+
+def page_routes(docs_dir: Path = DOCS_DIR, pages_dir: Path = PAGES_DIR) -> Set[str]:
+    """Return the route of every doc and page, works included.
+
+    Docs are served from the site root, at their frontmatter ``slug`` or else
+    at their path; ``index`` files stand for their directory.
+    """
+    routes: Set[str] = set()
+    for path in sorted(docs_dir.rglob("*")):
+        if path.suffix not in (".md", ".mdx"):
+            continue
+        relative = path.relative_to(docs_dir)
+        parents = [NUMBER_PREFIX.sub("", part) for part in relative.parent.parts]
+        stem = NUMBER_PREFIX.sub("", path.stem)
+        try:
+            slug = read_frontmatter_block(path)[0].get("slug")
+        except ValueError:
+            slug = None
+        if isinstance(slug, str) and slug.startswith("/"):
+            route = slug
+        elif isinstance(slug, str) and slug:
+            route = "/".join(["", *parents, slug])
+        elif stem.lower() in ("index", "readme") or (parents and stem == parents[-1]):
+            route = "/".join(["", *parents])
+        else:
+            route = "/".join(["", *parents, stem])
+        routes.add(route.rstrip("/") or "/")
+    if pages_dir.exists():
+        for path in pages_dir.rglob("*"):
+            if path.suffix not in PAGE_EXTENSIONS or path.name.startswith("_"):
+                continue
+            parts = list(path.relative_to(pages_dir).with_suffix("").parts)
+            if parts[-1] == "index":
+                parts.pop()
+            routes.add("/" + "/".join(parts))
+    return routes
+
+
+class WorkRecord:
+    """Frontmatter of a single work, with one slot per field in ``FIELDS``."""
+
+    __slots__ = FIELD_KEYS + ("path", "keys", "extra", "body_start")
+
+    def __init__(self, path: Path, metadata: Dict[str, Any], body_start: int) -> None:
+        self.path = path
+        self.keys = tuple(metadata)
+        self.body_start = body_start
+        self.extra: Dict[str, Any] = {}
+        for key in FIELD_KEYS:
+            setattr(self, key, None)
+        for key, value in metadata.items():
+            if key in FIELD_KEYS:
+                setattr(self, key, value)
+            else:
+                self.extra[key] = value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in FIELD_KEYS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the frontmatter in its original file order."""
+        return {key: self.get(key) for key in self.keys}
+
+    @property
+    def body_lines(self) -> List[str]:
+        text = self.path.read_text(encoding="utf-8")
+        return text.splitlines()[self.body_start :]
+
+    def __repr__(self) -> str:
+        return f"WorkRecord({self.path!s})"
+
+
+class WorkCatalog:
+    def __init__(self, root: Path = ROOT, works_dir: Path = WORKS_DIR) -> None:
+        self.root = root
+        self.works_dir = works_dir
+        self.records: List[WorkRecord] = []
+        self.errors: List[Tuple[Path, str]] = []
+        self._by_slug: Dict[str, List[WorkRecord]] = {}
+        self._by_path: Dict[str, WorkRecord] = {}
+        self._by_subject: Dict[str, List[WorkRecord]] = {}
+        self._issued_keys: List[str] = []
+        self._issued_records: List[WorkRecord] = []
+
+    @classmethod
+    def load(
+        cls,
+        root: Path = ROOT,
+        works_dir: Path = WORKS_DIR,
+        *,
+        strict: bool = True,
+        parse_cache: Optional[MediaStore] = None,
+    ) -> "WorkCatalog":
+        """Scan ``works_dir`` once and build every index.
+
+        With ``strict`` a malformed file raises ``ValueError``; otherwise it is
+        recorded in ``errors`` and skipped. When ``parse_cache`` is given,
+        files whose mtime and size are unchanged are not parsed again.
+        """
+        if not works_dir.exists():
+            raise FileNotFoundError(f"Works directory not found: {works_dir}")
+
+        catalog = cls(root, works_dir)
+        for md_path in sorted(works_dir.rglob("*.md")):
+            if md_path.name == "index.md":
+                continue
+            try:
+                metadata, body_start = catalog._parse(md_path, parse_cache)
+            except ValueError as err:
+                if strict:
+                    raise
+                catalog.errors.append((md_path, str(err)))
+                continue
+            catalog.add(WorkRecord(md_path, metadata, body_start))
+        catalog._build_issued_index()
+        return catalog
+
+    def _parse(self, md_path: Path, parse_cache: Optional[MediaStore]) -> Tuple[Dict[str, Any], int]:
+        if parse_cache is None:
+            return read_frontmatter_block(md_path)
+        stat = md_path.stat()
+        key = str(md_path.relative_to(self.root))
+        cached = parse_cache.get_frontmatter(key, stat.st_mtime_ns, stat.st_size)
+        if cached is not None:
+            return cached
+        metadata, body_start = read_frontmatter_block(md_path)
+        parse_cache.put_frontmatter(key, stat.st_mtime_ns, stat.st_size, metadata, body_start)
+        return metadata, body_start
+
+    def add(self, record: WorkRecord) -> None:
+        self.records.append(record)
+        self._by_path[self.relative_path(record)] = record
+        if record.slug:
+            self._by_slug.setdefault(str(record.slug), []).append(record)
+        if record.subject:
+            self._by_subject.setdefault(str(record.subject), []).append(record)
+
+    def _build_issued_index(self) -> None:
+        dated = sorted(
+            ((str(record.issued), record) for record in self.records if record.issued),
+            key=lambda item: item[0],
+        )
+        self._issued_keys = [key for key, _ in dated]
+        self._issued_records = [record for _, record in dated]
+
+    def relative_path(self, record: WorkRecord) -> str:
+        return str(record.path.relative_to(self.root))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[WorkRecord]:
+        return iter(self.records)
+
+    def by_slug(self, slug: str) -> Optional[WorkRecord]:
+        matches = self._by_slug.get(slug)
+        return matches[0] if matches else None
+
+    def all_by_slug(self, slug: str) -> List[WorkRecord]:
+        return list(self._by_slug.get(slug, []))
+
+    def slugs(self) -> Dict[str, List[WorkRecord]]:
+        return self._by_slug
+
+    def by_path(self, path: str) -> Optional[WorkRecord]:
+        """Look up a record by its path relative to the repository root."""
+        return self._by_path.get(path)
+
+    def by_subject(self, subject: str) -> List[WorkRecord]:
+        return list(self._by_subject.get(subject, []))
+
+    def issued_between(self, start: str, end: str) -> List[WorkRecord]:
+        """Return works issued within ``start``..``end`` (inclusive ISO dates)."""
+        lo = bisect_left(self._issued_keys, start)
+        hi = bisect_right(self._issued_keys, end)
+        return self._issued_records[lo:hi]
+
+    def by_issued(self, *, newest_first: bool = False) -> List[WorkRecord]:
+        if newest_first:
+            return self._issued_records[::-1]
+        return list(self._issued_records)
+
+    def to_entries(self) -> List[Dict[str, Any]]:
+        """Return one dict per work, as written to the works index."""
+        entries: List[Dict[str, Any]] = []
+        for record in self.records:
+            entry = record.to_dict()
+            entry["file"] = self.relative_path(record)
+            entries.append(entry)
+        return entries
+
+
+class ValueIndex:
+    """Prefix index over the distinct values used for one field.
+
+    Values are kept in a case-folded sorted array, so a prefix lookup is a
+    pair of binary searches; matches are ranked by how often they are used.
+    """
+
+    def __init__(self, counts: Dict[str, int]) -> None:
+        ordered = sorted(counts.items(), key=lambda item: (item[0].casefold(), item[0]))
+        self.keys = [value.casefold() for value, _ in ordered]
+        self.values = [value for value, _ in ordered]
+        self.counts = [count for _, count in ordered]
+
+    def complete(self, prefix: str, limit: int = 5) -> List[str]:
+        folded = prefix.casefold()
+        lo = bisect_left(self.keys, folded)
+        hi = bisect_left(self.keys, folded + "\U0010ffff")
+        best = heapq.nsmallest(limit, range(lo, hi), key=lambda idx: (-self.counts[idx], self.keys[idx]))
+        return [self.values[idx] for idx in best]
+
+    def to_pairs(self) -> List[Tuple[str, int]]:
+        return list(zip(self.values, self.counts))
+
+
+def build_value_indexes(entries: List[Dict[str, Any]]) -> Dict[str, ValueIndex]:
+    counts: Dict[str, Dict[str, int]] = {key: {} for key in COMPLETION_FIELDS}
+    for entry in entries:
+        for key in COMPLETION_FIELDS:
+            value = entry.get(key)
+            if value is None or value == "":
+                continue
+            field_counts = counts[key]
+            field_counts[str(value)] = field_counts.get(str(value), 0) + 1
+    return {key: ValueIndex(field_counts) for key, field_counts in counts.items()}
+
+
+def save_value_indexes(indexes: Dict[str, ValueIndex], path: Path) -> None:
+    payload = {key: index.to_pairs() for key, index in indexes.items()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+
+def load_value_indexes(path: Path) -> Dict[str, ValueIndex]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return {key: ValueIndex(dict(pairs)) for key, pairs in payload.items()}
@@ -0,0 +1,24 @@
+import type {ReactElement} from 'react';
+import works from '@site/computed/works-index.json';
+import {FeedItem, type Work} from './FeedItem';
+
+const getLatestWorks = (): Work[] => {
+  const byIssuedDesc = [...works].sort((a, b) => {
+    const aTime = Date.parse(a.issued ?? a.created ?? '') || 0;
+    const bTime = Date.parse(b.issued ?? b.created ?? '') || 0;
+    return bTime - aTime;
+  });
+
+  return byIssuedDesc.slice(0, 10);
+};
+
+// Loaded lazily by Feed, so only feeds without slugs pull in the full index.
+export default function LatestWorks(): ReactElement {
+  return (
+    <>
+      {getLatestWorks().map((work) => (
+        <FeedItem key={work.slug} work={work} />
+      ))}
+    </>
+  );
+}
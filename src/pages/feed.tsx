@@ -1,11 +1,19 @@
 import {useEffect, useRef, useState, useCallback, type CSSProperties, type ReactElement, type RefObject} from 'react';
 import Layout from '@theme/Layout';
 import Link from '@docusaurus/Link';
+import {useBaseUrlUtils} from '@docusaurus/useBaseUrl';
 import ForceDarkMode from '@site/src/components/ForceDarkMode';
 import works from '@site/computed/works-index.json';
 
 type Work = (typeof works)[number];
 
+type Rendition = {
+  src: string;
+  width: number;
+  height: number;
+  size: number;
+};
+
 
 const getLatestWorks = (): Work[] => {
   const byIssuedDesc = [...works].sort((a, b) => {
@@ -51,11 +59,33 @@ const inferMediaKind = (source?: string): 'video' | 'image' | 'unknown' => {
 const getPreferredSource = (work: Work): string | undefined =>
   work.previewSource || work.staticPreviewSource || work.fileSource;
 
-const renderMedia = (work: Work): ReactElement => {
+const getRenditions = (work: Work): Rendition[] =>
+  (work as {previewRenditions?: Rendition[]}).previewRenditions ?? [];
+
+// .feed-card__media shows a video at its natural size, limited to 100vw x 100vh.
+// Returns the CSS width the original preview is displayed at.
+const getDisplayedWidth = (width: number, height: number): number =>
+  Math.min(width, window.innerWidth, (window.innerHeight * width) / height);
+
+// Smallest rendition that covers the original's displayed width at the
+// device pixel ratio. Such a rendition is also displayed at that width, so
+// swapping it in changes the bytes but not the layout. Undefined means the
+// original preview is served.
+const selectRendition = (work: Work, renditions: Rendition[]): Rendition | undefined => {
+  const {mediaWidth, mediaHeight} = work as {mediaWidth?: number; mediaHeight?: number};
+  if (!renditions.length || !mediaWidth || !mediaHeight || typeof window === 'undefined') {
+    return undefined;
+  }
+  const targetWidth = getDisplayedWidth(mediaWidth, mediaHeight) * (window.devicePixelRatio || 1);
+  return renditions.find((rendition) => rendition.width >= targetWidth);
+};
+
+const renderMedia = (work: Work, withBaseUrl: (url: string) => string): ReactElement => {
   const source = getPreferredSource(work);
   const kind = inferMediaKind(source);
 
   if (kind === 'video' && source) {
+    const rendition = source === work.previewSource ? selectRendition(work, getRenditions(work)) : undefined;
     return (
       <video
         className="feed-card__media"
@@ -65,7 +95,7 @@ const renderMedia = (work: Work): ReactElement => {
         playsInline
         preload="metadata"
         aria-hidden="true">
-        <source src={source} />
+        <source src={rendition ? withBaseUrl(rendition.src) : source} />
       </video>
     );
   }
@@ -192,6 +222,7 @@ type FeedCardProps = {
 const FeedCard = ({work}: FeedCardProps): ReactElement => {
   const {ref: viewportRef, isVisible} = useInViewport();
   const {ref: progressRef, progress} = useScrollProgress();
+  const {withBaseUrl} = useBaseUrlUtils();
   const overlayOpacity = getOverlayOpacity(progress);
   const overlayStyle = {
     '--feed-card-overlay-opacity': overlayOpacity,
@@ -202,7 +233,7 @@ const FeedCard = ({work}: FeedCardProps): ReactElement => {
       {isVisible ? (
         <Link to={work.slug} className="feed-card__link">
           <div className="feed-card__mediaWrapper" ref={progressRef}>
-            {renderMedia(work)}
+            {renderMedia(work, withBaseUrl)}
             <div className="feed-card__overlay" style={overlayStyle}>
               <div className="feed-card__overlayContent">
                 <h2 className="feed-card__title">{work.title}</h2>
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.build_work_index import report_feed_budget, select_rendition
+
+RENDITIONS = [
+    {"src": "360p.mp4", "width": 640, "height": 360},
+    {"src": "720p.mp4", "width": 1280, "height": 720},
+]
+
+
+def test_select_rendition_keeps_original_when_displayed_larger_than_renditions():
+    # A 1080p video on a 1920x1000 desktop is displayed about 1778px wide.
+    assert select_rendition(RENDITIONS, 1920, 1080, (1920, 1000), 1) is None
+
+
+def test_select_rendition_covers_displayed_width_at_pixel_ratio():
+    rendition = select_rendition(RENDITIONS, 1920, 1080, (390, 844), 3)
+
+    assert rendition["src"] == "720p.mp4"
+
+
+def test_select_rendition_uses_viewport_height_limit():
+    # 100vh caps the height at 300px, so the video is displayed 533px wide.
+    rendition = select_rendition(RENDITIONS, 1920, 1080, (1920, 300), 1)
+
+    assert rendition["src"] == "360p.mp4"
+
+
+def feed_entry(name, issued):
+    return {
+        "file": f"docs/works/{name}.md",
+        "issued": issued,
+        "previewSource": f"https://cdn.example.com/{name}.mp4",
+    }
+
+
+def test_report_feed_budget_counts_rendition_instead_of_original(capsys):
+    works = [feed_entry("a", "2025-01-02")]
+    lock = {
+        "https://cdn.example.com/a.mp4": {
+            "width": 1920,
+            "height": 1080,
+            "size": 50 * 1024 * 1024,
+            "renditions": [{"src": "720p.mp4", "width": 1280, "height": 720, "size": 5 * 1024 * 1024}],
+        }
+    }
+
+    violations = report_feed_budget(works, lock, {}, asset_budget=10 * 1024 * 1024, viewport=(1280, 800))
+
+    assert violations == []
+    assert "5.0 MB served across 1 assets (50.0 MB as originals)" in capsys.readouterr().out
+
+
+def test_report_feed_budget_fails_unknown_sizes_only_when_enforced():
+    works = [feed_entry("a", "2025-01-02"), feed_entry("b", "2025-01-01")]
+    lock = {"https://cdn.example.com/a.mp4": {"width": 640, "height": 360, "size": 1024}}
+
+    assert report_feed_budget(works, lock, {}) == []
+    violations = report_feed_budget(works, lock, {}, total_budget=1024 * 1024)
+
+    assert len(violations) == 1
+    assert violations[0].startswith("docs/works/b.md: size of https://cdn.example.com/b.mp4 is unknown")
@@ -0,0 +1,97 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.media_renditions import (
+    describe_rendition,
+    ffmpeg_available,
+    plan_renditions,
+    run_jobs,
+)
+
+needs_ffmpeg = pytest.mark.skipif(not ffmpeg_available(), reason="ffmpeg is not installed")
+
+
+def test_plan_renditions_never_upscales(tmp_path):
+    jobs = plan_renditions(tmp_path / "clip.mp4", 1920, 1080, tmp_path / "out", "ab" * 32)
+
+    assert [(job.width, job.height, job.bitrate) for job in jobs] == [
+        (640, 360, "800k"),
+        (1280, 720, "2500k"),
+    ]
+    assert jobs[0].output == tmp_path / "out" / ("ab" * 8) / "360p.mp4"
+
+
+def test_plan_renditions_portrait_scales_short_side(tmp_path):
+    jobs = plan_renditions(tmp_path / "clip.mp4", 1080, 1920, tmp_path / "out", "cd" * 32)
+
+    assert [(job.width, job.height) for job in jobs] == [(360, 640), (720, 1280)]
+
+
+def test_plan_renditions_small_source_has_no_jobs(tmp_path):
+    assert plan_renditions(tmp_path / "clip.mp4", 640, 360, tmp_path / "out", "ef" * 32) == []
+
+
+def make_clip(path: Path, width: int, height: int) -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=size={width}x{height}:rate=10:duration=1",
+            "-pix_fmt",
+            "yuv420p",
+            str(path),
+        ],
+        check=True,
+    )
+
+
+def probe_size(path: Path):
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=width,height",
+            "-of",
+            "json",
+            str(path),
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    stream = json.loads(result.stdout)["streams"][0]
+    return stream["width"], stream["height"]
+
+
+@needs_ffmpeg
+def test_encode_fixture_clip(tmp_path):
+    source = tmp_path / "clip.mp4"
+    make_clip(source, 1280, 720)
+    output_dir = tmp_path / "renditions"
+    jobs = plan_renditions(source, 1280, 720, output_dir, "12" * 32)
+
+    errors = run_jobs(jobs, workers=1)
+
+    assert errors == {str(jobs[0].output): None}
+    assert probe_size(jobs[0].output) == (640, 360)
+    assert not list(jobs[0].output.parent.glob("*.part.mp4"))
+    described = describe_rendition(jobs[0], output_dir, "https://cdn.example.com/renditions/")
+    assert described["src"] == "https://cdn.example.com/renditions/1212121212121212/360p.mp4"
+    assert described["size"] == jobs[0].output.stat().st_size
@@ -0,0 +1,89 @@
+import sys
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.media_fetch import FetchPolicy
+from scripts.validate_works import RateLimiter, check_integrity, check_link
+from scripts.work_catalog import WorkCatalog, page_routes
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def media_server(tmp_path):
+    (tmp_path / "ü.mp4").write_bytes(b"\x00" * 128)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(tmp_path)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def run_check(url):
+    return check_link(url, FetchPolicy(retries=0), RateLimiter(1000))
+
+
+def test_check_link_non_ascii_url(media_server):
+    result = run_check(f"{media_server}/ü.mp4")
+
+    assert result["ok"] is True
+    assert result["status"] == 200
+    assert result["size"] == 128
+
+
+def test_check_link_missing_file_is_broken(media_server):
+    result = run_check(f"{media_server}/missing.mp4")
+
+    assert result["ok"] is False
+    assert result["status"] == 404
+
+
+@pytest.mark.parametrize("url", ["http://exa mple.com/x.mp4", "http://127.0.0.1:port/x.mp4"])
+def test_check_link_malformed_url_is_broken(url):
+    result = run_check(url)
+
+    assert result["ok"] is False
+    assert result["status"] is None
+    assert "invalid URL" in result["error"]
+
+
+def write_doc(path, **frontmatter):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["---", *(f"{key}: {value}" for key, value in frontmatter.items()), "---", ""]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def test_check_integrity_accepts_relations_to_index_and_doc_pages(tmp_path):
+    docs = tmp_path / "docs"
+    write_doc(docs / "works" / "Series" / "index.md", title="Series", slug="/series")
+    write_doc(docs / "works" / "Other" / "index.md", title="Other")
+    write_doc(docs / "concepts" / "art.md", title="Art")
+    for name, relation in [("a", "/series"), ("b", "/works/Other/"), ("c", "/concepts/art"), ("d", "/works/a")]:
+        write_doc(docs / "works" / "Series" / f"{name}.md", title=name, slug=f"/works/{name}", relation=relation)
+    catalog = WorkCatalog.load(tmp_path, docs / "works")
+
+    issues = check_integrity(catalog, page_routes(docs, tmp_path / "src" / "pages"))
+
+    assert issues == []
+
+
+def test_check_integrity_reports_dangling_relation(tmp_path):
+    docs = tmp_path / "docs"
+    write_doc(docs / "works" / "a.md", title="a", slug="/works/a", relation="/works/missing")
+    catalog = WorkCatalog.load(tmp_path, docs / "works")
+
+    issues = check_integrity(catalog, page_routes(docs, tmp_path / "src" / "pages"))
+
+    assert issues == ["Relation '/works/missing' in docs/works/a.md does not match any page slug."]